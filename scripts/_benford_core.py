@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+EXPECTED_ARR = np.array([math.log10(1 + 1 / digit) for digit in range(1, 10)])
+# Below this many values the NumPy path keeps pace with the JIT kernel, so Numba is only used above it.
+NUMBA_MIN_VALUES = 1_000_000
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def leading_digits_njit(values: np.ndarray, out: np.ndarray) -> None:
+        for i in range(values.shape[0]):
+            exponent = math.floor(math.log10(values[i]))
+            if exponent < 0:
+                scaled = values[i] * 10.0 ** -exponent
+            else:
+                scaled = values[i] / 10.0 ** exponent
+            if scaled < 1:
+                scaled *= 10
+            elif scaled >= 10:
+                scaled /= 10
+            out[i] = int(scaled)
+
+else:
+    leading_digits_njit = None
+
+
+def leading_digits_vec(series: pd.Series) -> np.ndarray:
+    values = np.abs(pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64))
+    # Zeros have no leading digit; subnormals would overflow the 10**-n scale factor below.
+    values = values[np.isfinite(values) & (values >= np.finfo(np.float64).tiny)]
+    if leading_digits_njit is not None and values.shape[0] >= NUMBA_MIN_VALUES:
+        digits = np.empty(values.shape[0], dtype=np.int8)
+        leading_digits_njit(values, digits)
+        return digits
+    exponent = np.floor(np.log10(values))
+    # Scale small values up rather than dividing by an inexact 10**-n so 0.3 stays 3.0, not 2.999...
+    scaled = np.where(exponent < 0, values * np.power(10.0, -exponent), values / np.power(10.0, exponent))
+    # log10 can land a hair off near powers of ten; nudge those back into 1-9.
+    scaled = np.where(scaled < 1, scaled * 10, np.where(scaled >= 10, scaled / 10, scaled))
+    return np.floor(scaled).astype(np.int8)
+
+
+def read_numeric_sheet(excel: pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+    # Both engines parse every cell regardless of usecols, so project right after the read
+    # and let the non-numeric columns be freed before analysis starts.
+    return excel.parse(sheet_name).select_dtypes(include="number")
+
+
+def analyze_numeric_column(
+    series: pd.Series, sheet_name: str, column_name: str, digits: np.ndarray | None = None
+) -> tuple[pd.DataFrame, dict]:
+    if digits is None:
+        digits = leading_digits_vec(series)
+    total = int(digits.shape[0])
+
+    counts_arr = np.bincount(digits, minlength=10)[1:10]
+    proportions_arr = counts_arr / total if total > 0 else np.zeros(9)
+    difference_arr = proportions_arr - EXPECTED_ARR
+
+    detail_df = pd.DataFrame(
+        {
+            "sheet": sheet_name,
+            "column": column_name,
+            "digit": np.arange(1, 10, dtype=np.int8),
+            "count": counts_arr.astype(np.int32),
+            "proportion": proportions_arr,
+            "expected_proportion": EXPECTED_ARR,
+            "difference": difference_arr,
+        }
+    )
+
+    if total > 0:
+        expected_counts = EXPECTED_ARR * total
+        chi_square = float(((counts_arr - expected_counts) ** 2 / expected_counts).sum())
+        mad = float(np.abs(difference_arr).mean())
+    else:
+        chi_square = 0.0
+        mad = 0.0
+
+    summary = {
+        "sheet": sheet_name,
+        "column": column_name,
+        "total_values": total,
+        "chi_square": chi_square,
+        "mad": mad,
+    }
+
+    return detail_df, summary
@@ -0,0 +1,11 @@
+from pathlib import Path
+
+import pandas as pd
+
+
+def open_excel(input_path: Path) -> pd.ExcelFile:
+    try:
+        return pd.ExcelFile(input_path, engine="calamine")
+    # ImportError: python-calamine is missing; ValueError: pandas < 2.2 has no calamine engine.
+    except (ImportError, ValueError):
+        return pd.ExcelFile(input_path)
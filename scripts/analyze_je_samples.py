@@ -3,6 +3,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from _excel_io import open_excel
+
 
 def find_date_columns(df: pd.DataFrame) -> list[str]:
     date_columns = []
@@ -60,10 +62,9 @@ def summarize_sheet(df: pd.DataFrame, sheet_name: str, output_dir: Path) -> dict
 
 def markdown_table(df: pd.DataFrame) -> str:
     headers = [str(col) for col in df.columns]
-    rows = df.astype(str).values.tolist()
     header_line = "| " + " | ".join(headers) + " |"
     separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-    row_lines = ["| " + " | ".join(row) + " |" for row in rows]
+    row_lines = ["| " + " | ".join(map(str, row)) + " |" for row in df.itertuples(index=False, name=None)]
     return "\n".join([header_line, separator_line, *row_lines])
 
 
@@ -77,12 +78,11 @@ def main() -> None:
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    excel = pd.ExcelFile(input_path)
     summary_rows = []
 
-    for sheet_name in excel.sheet_names:
-        df = pd.read_excel(input_path, sheet_name=sheet_name)
-        summary_rows.append(summarize_sheet(df, sheet_name, output_dir))
+    with open_excel(input_path) as excel:
+        for sheet_name in excel.sheet_names:
+            summary_rows.append(summarize_sheet(excel.parse(sheet_name), sheet_name, output_dir))
 
     summary_df = pd.DataFrame(summary_rows)
     summary_df.to_csv(output_dir / "sheet_summary.csv", index=False)
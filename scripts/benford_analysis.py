@@ -1,80 +1,37 @@
 import argparse
-import math
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
 import pandas as pd
 
+from _benford_core import analyze_numeric_column, read_numeric_sheet
+from _excel_io import open_excel
 
-def leading_digit(value: float) -> int | None:
-    if pd.isna(value):
-        return None
-    try:
-        number = float(value)
-    except (TypeError, ValueError):
-        return None
-    if number == 0:
-        return None
-    number = abs(number)
-    while number < 1:
-        number *= 10
-    digit = int(str(number)[0])
-    if digit == 0:
-        return None
-    return digit
-
-
-def expected_benford_distribution() -> dict[int, float]:
-    return {digit: math.log10(1 + 1 / digit) for digit in range(1, 10)}
-
-
-def analyze_numeric_column(series: pd.Series, sheet_name: str, column_name: str) -> tuple[pd.DataFrame, dict]:
-    digits = series.map(leading_digit).dropna().astype(int)
-    total = int(digits.shape[0])
-    expected = expected_benford_distribution()
-
-    counts = digits.value_counts().reindex(range(1, 10), fill_value=0).sort_index()
-    proportions = counts / total if total > 0 else counts.astype(float)
-
-    detail_rows = []
-    for digit in range(1, 10):
-        detail_rows.append(
-            {
-                "sheet": sheet_name,
-                "column": column_name,
-                "digit": digit,
-                "count": int(counts[digit]),
-                "proportion": float(proportions[digit]) if total > 0 else 0.0,
-                "expected_proportion": expected[digit],
-                "difference": float(proportions[digit]) - expected[digit] if total > 0 else -expected[digit],
-            }
-        )
-
-    if total > 0:
-        expected_counts = pd.Series({digit: expected[digit] * total for digit in range(1, 10)})
-        chi_square = float(((counts - expected_counts) ** 2 / expected_counts).sum())
-        mad = float((proportions - pd.Series(expected)).abs().mean())
-    else:
-        chi_square = 0.0
-        mad = 0.0
-
-    summary = {
-        "sheet": sheet_name,
-        "column": column_name,
-        "total_values": total,
-        "chi_square": chi_square,
-        "mad": mad,
-    }
-
-    return pd.DataFrame(detail_rows), summary
-
-
-def markdown_table(df: pd.DataFrame) -> str:
+
+def process_sheet(input_path: Path, sheet_name: str) -> tuple[list[pd.DataFrame], list[dict]]:
+    with open_excel(input_path) as excel:
+        return analyze_sheet(read_numeric_sheet(excel, sheet_name), sheet_name)
+
+
+def analyze_sheet(numeric_cols: pd.DataFrame, sheet_name: str) -> tuple[list[pd.DataFrame], list[dict]]:
+    detail_frames = []
+    summary_rows = []
+    for column_name in numeric_cols.columns:
+        detail_df, summary = analyze_numeric_column(numeric_cols[column_name], sheet_name, column_name)
+        detail_frames.append(detail_df)
+        summary_rows.append(summary)
+    return detail_frames, summary_rows
+
+
+def iter_markdown_rows(df: pd.DataFrame) -> Iterator[str]:
     headers = [str(col) for col in df.columns]
-    rows = df.astype(str).values.tolist()
-    header_line = "| " + " | ".join(headers) + " |"
-    separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-    row_lines = ["| " + " | ".join(row) + " |" for row in rows]
-    return "\n".join([header_line, separator_line, *row_lines])
+    yield "| " + " | ".join(headers) + " |"
+    yield "| " + " | ".join(["---"] * len(headers)) + " |"
+    for row in df.itertuples(index=False, name=None):
+        yield "| " + " | ".join(map(str, row)) + " |"
 
 
 def main() -> None:
@@ -87,19 +44,22 @@ def main() -> None:
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    excel = pd.ExcelFile(input_path)
+    with open_excel(input_path) as excel:
+        sheet_names = excel.sheet_names
+        if len(sheet_names) > 1:
+            # Workers can't share the open handle, so each one reopens the file for its sheet.
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(partial(process_sheet, input_path), sheet_names))
+        else:
+            results = [
+                analyze_sheet(read_numeric_sheet(excel, sheet_name), sheet_name) for sheet_name in sheet_names
+            ]
+
     detail_frames = []
     summary_rows = []
-
-    for sheet_name in excel.sheet_names:
-        df = pd.read_excel(input_path, sheet_name=sheet_name)
-        numeric_cols = df.select_dtypes(include="number")
-        if numeric_cols.empty:
-            continue
-        for column_name in numeric_cols.columns:
-            detail_df, summary = analyze_numeric_column(numeric_cols[column_name], sheet_name, column_name)
-            detail_frames.append(detail_df)
-            summary_rows.append(summary)
+    for sheet_detail_frames, sheet_summary_rows in results:
+        detail_frames.extend(sheet_detail_frames)
+        summary_rows.extend(sheet_summary_rows)
 
     detail_df = pd.concat(detail_frames, ignore_index=True) if detail_frames else pd.DataFrame(
         columns=["sheet", "column", "digit", "count", "proportion", "expected_proportion", "difference"]
@@ -113,22 +73,27 @@ def main() -> None:
 
     top_deviations = summary_df.sort_values("mad", ascending=False).head(10)
 
-    summary_lines = [
-        "# Benford Analysis Summary",
-        "",
-        f"Input file: `{input_path}`",
-        "",
-        "## Top MAD deviations",
-        markdown_table(top_deviations) if not top_deviations.empty else "No numeric data available.",
-        "",
-        "## Outputs",
-        "- `benford_detail.csv`: per-digit counts and proportions",
-        "- `benford_summary.csv`: chi-square and MAD per numeric column",
-        "",
-        "Generated by `scripts/benford_analysis.py`.",
-    ]
-
-    (output_dir / "summary.md").write_text("\n".join(summary_lines))
+    summary_lines = chain(
+        [
+            "# Benford Analysis Summary",
+            "",
+            f"Input file: `{input_path}`",
+            "",
+            "## Top MAD deviations",
+        ],
+        iter_markdown_rows(top_deviations) if not top_deviations.empty else ["No numeric data available."],
+        [
+            "",
+            "## Outputs",
+            "- `benford_detail.csv`: per-digit counts and proportions",
+            "- `benford_summary.csv`: chi-square and MAD per numeric column",
+            "",
+            "Generated by `scripts/benford_analysis.py`.",
+        ],
+    )
+
+    with (output_dir / "summary.md").open("w") as summary_file:
+        summary_file.writelines(f"{line}\n" for line in summary_lines)
 
 
 if __name__ == "__main__":
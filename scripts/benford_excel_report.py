@@ -1,94 +1,79 @@
 import argparse
-import math
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import Cell
 from openpyxl.chart import BarChart, Reference
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 
+from _benford_core import EXPECTED_ARR, analyze_numeric_column, leading_digits_vec, read_numeric_sheet
+from _excel_io import open_excel
+
 UVU_GREEN = "006633"
 UVU_DARK_GREEN = "004B2E"
 UVU_GRAY = "4D4D4D"
 UVU_LIGHT_GRAY = "E6E6E6"
 UVU_GOLD = "CBA135"
 
+WHITE_BOLD_FONT = Font(color="FFFFFF", bold=True)
+TITLE_FONT = Font(color="FFFFFF", bold=True, size=16)
+LABEL_FONT = Font(bold=True, color=UVU_GRAY)
+SECTION_FONT = Font(bold=True, color=UVU_GREEN, size=12)
+HEADER_FILL = PatternFill("solid", fgColor=UVU_GREEN)
+TITLE_FILL = PatternFill("solid", fgColor=UVU_DARK_GREEN)
+ACCENT_FILL = PatternFill("solid", fgColor=UVU_LIGHT_GRAY)
+SECTION_FILL = PatternFill("solid", fgColor=UVU_GOLD)
+CENTER = Alignment(horizontal="center", vertical="center")
+CENTER_HORIZONTAL = Alignment(horizontal="center")
+PERCENT_FORMAT = "0.0%"
+
+
+def process_sheet(input_path: Path, sheet_name: str) -> tuple[list[pd.DataFrame], list[dict], list[np.ndarray]]:
+    with open_excel(input_path) as excel:
+        return analyze_sheet(read_numeric_sheet(excel, sheet_name), sheet_name)
+
+
+def analyze_sheet(
+    numeric_cols: pd.DataFrame, sheet_name: str
+) -> tuple[list[pd.DataFrame], list[dict], list[np.ndarray]]:
+    detail_frames = []
+    summary_rows = []
+    digit_arrays = []
+    for column_name in numeric_cols.columns:
+        series = numeric_cols[column_name]
+        digits = leading_digits_vec(series)
+        digit_arrays.append(digits)
+        detail_df, summary = analyze_numeric_column(series, sheet_name, column_name, digits)
+        detail_frames.append(detail_df)
+        summary_rows.append(summary)
+    return detail_frames, summary_rows, digit_arrays
+
+
+def autofit_columns(worksheet, df: pd.DataFrame, headers: list[str] | None = None, sample_rows: int = 500) -> None:
+    labels = headers if headers is not None else [str(col) for col in df.columns]
+    sample = df.head(sample_rows)
+    for col_idx, label in enumerate(labels, start=1):
+        values = sample.iloc[:, col_idx - 1]
+        length = max(len(label), int(values.astype(str).str.len().max()) if not values.empty else 0)
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = max(12, length + 2)
 
-def leading_digit(value: float) -> int | None:
-    if pd.isna(value):
-        return None
-    try:
-        number = float(value)
-    except (TypeError, ValueError):
-        return None
-    if number == 0:
-        return None
-    number = abs(number)
-    while number < 1:
-        number *= 10
-    digit = int(str(number)[0])
-    if digit == 0:
-        return None
-    return digit
-
-
-def expected_benford_distribution() -> dict[int, float]:
-    return {digit: math.log10(1 + 1 / digit) for digit in range(1, 10)}
-
-
-def analyze_numeric_column(series: pd.Series, sheet_name: str, column_name: str) -> tuple[pd.DataFrame, dict]:
-    digits = series.map(leading_digit).dropna().astype(int)
-    total = int(digits.shape[0])
-    expected = expected_benford_distribution()
-
-    counts = digits.value_counts().reindex(range(1, 10), fill_value=0).sort_index()
-    proportions = counts / total if total > 0 else counts.astype(float)
-
-    detail_rows = []
-    for digit in range(1, 10):
-        detail_rows.append(
-            {
-                "sheet": sheet_name,
-                "column": column_name,
-                "digit": digit,
-                "count": int(counts[digit]),
-                "proportion": float(proportions[digit]) if total > 0 else 0.0,
-                "expected_proportion": expected[digit],
-                "difference": float(proportions[digit]) - expected[digit] if total > 0 else -expected[digit],
-            }
-        )
-
-    if total > 0:
-        expected_counts = pd.Series({digit: expected[digit] * total for digit in range(1, 10)})
-        chi_square = float(((counts - expected_counts) ** 2 / expected_counts).sum())
-        mad = float((proportions - pd.Series(expected)).abs().mean())
-    else:
-        chi_square = 0.0
-        mad = 0.0
-
-    summary = {
-        "sheet": sheet_name,
-        "column": column_name,
-        "total_values": total,
-        "chi_square": chi_square,
-        "mad": mad,
-    }
-
-    return pd.DataFrame(detail_rows), summary
-
-
-def autofit_columns(worksheet) -> None:
-    for column_cells in worksheet.columns:
-        length = max(len(str(cell.value)) if cell.value is not None else 0 for cell in column_cells)
-        worksheet.column_dimensions[get_column_letter(column_cells[0].column)].width = max(12, length + 2)
+
+def percent_cell(worksheet, value: float) -> Cell:
+    cell = Cell(worksheet, value=value)
+    cell.number_format = PERCENT_FORMAT
+    return cell
 
 
 def apply_header_style(cell) -> None:
-    cell.font = Font(color="FFFFFF", bold=True)
-    cell.fill = PatternFill("solid", fgColor=UVU_GREEN)
-    cell.alignment = Alignment(horizontal="center", vertical="center")
+    cell.font = WHITE_BOLD_FONT
+    cell.fill = HEADER_FILL
+    cell.alignment = CENTER
 
 
 def main() -> None:
@@ -105,24 +90,24 @@ def main() -> None:
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    excel = pd.ExcelFile(input_path)
+    with open_excel(input_path) as excel:
+        sheet_names = excel.sheet_names
+        if len(sheet_names) > 1:
+            # Workers can't share the open handle, so each one reopens the file for its sheet.
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(partial(process_sheet, input_path), sheet_names))
+        else:
+            results = [
+                analyze_sheet(read_numeric_sheet(excel, sheet_name), sheet_name) for sheet_name in sheet_names
+            ]
+
     detail_frames = []
     summary_rows = []
-    all_digits = []
-
-    for sheet_name in excel.sheet_names:
-        df = pd.read_excel(input_path, sheet_name=sheet_name)
-        numeric_cols = df.select_dtypes(include="number")
-        if numeric_cols.empty:
-            continue
-        for column_name in numeric_cols.columns:
-            series = numeric_cols[column_name]
-            digits = series.map(leading_digit).dropna().astype(int)
-            if not digits.empty:
-                all_digits.extend(digits.tolist())
-            detail_df, summary = analyze_numeric_column(series, sheet_name, column_name)
-            detail_frames.append(detail_df)
-            summary_rows.append(summary)
+    all_digit_arrays: list[np.ndarray] = []
+    for sheet_detail_frames, sheet_summary_rows, sheet_digit_arrays in results:
+        detail_frames.extend(sheet_detail_frames)
+        summary_rows.extend(sheet_summary_rows)
+        all_digit_arrays.extend(sheet_digit_arrays)
 
     detail_df = pd.concat(detail_frames, ignore_index=True) if detail_frames else pd.DataFrame(
         columns=["sheet", "column", "digit", "count", "proportion", "expected_proportion", "difference"]
@@ -131,18 +116,17 @@ def main() -> None:
         columns=["sheet", "column", "total_values", "chi_square", "mad"]
     )
 
-    expected = expected_benford_distribution()
-    all_digit_series = pd.Series(all_digits) if all_digits else pd.Series(dtype=int)
-    overall_counts = all_digit_series.value_counts().reindex(range(1, 10), fill_value=0).sort_index()
-    overall_total = int(overall_counts.sum())
-    overall_proportions = overall_counts / overall_total if overall_total > 0 else overall_counts.astype(float)
+    all_digits = np.concatenate(all_digit_arrays) if all_digit_arrays else np.empty(0, dtype=np.int8)
+    overall_counts_arr = np.bincount(all_digits, minlength=10)[1:10]
+    overall_total = int(overall_counts_arr.sum())
+    overall_proportions_arr = overall_counts_arr / overall_total if overall_total > 0 else np.zeros(9)
 
     overall_table = pd.DataFrame(
         {
-            "digit": range(1, 10),
-            "actual_count": [int(overall_counts[digit]) for digit in range(1, 10)],
-            "actual_percent": [float(overall_proportions[digit]) for digit in range(1, 10)],
-            "expected_percent": [expected[digit] for digit in range(1, 10)],
+            "digit": np.arange(1, 10, dtype=np.int8),
+            "actual_count": overall_counts_arr,
+            "actual_percent": overall_proportions_arr,
+            "expected_percent": EXPECTED_ARR,
         }
     )
 
@@ -155,9 +139,9 @@ def main() -> None:
     summary_sheet.merge_cells("A1:G1")
     title_cell = summary_sheet["A1"]
     title_cell.value = "Benford's Law Analysis Report"
-    title_cell.font = Font(color="FFFFFF", bold=True, size=16)
-    title_cell.fill = PatternFill("solid", fgColor=UVU_DARK_GREEN)
-    title_cell.alignment = Alignment(horizontal="center")
+    title_cell.font = TITLE_FONT
+    title_cell.fill = TITLE_FILL
+    title_cell.alignment = CENTER_HORIZONTAL
 
     summary_sheet["A2"].value = "Input File"
     summary_sheet["B2"].value = str(input_path)
@@ -165,10 +149,10 @@ def main() -> None:
     summary_sheet["B3"].value = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     for cell in (summary_sheet["A2"], summary_sheet["A3"]):
-        cell.font = Font(bold=True, color=UVU_GRAY)
+        cell.font = LABEL_FONT
 
     summary_sheet["A5"].value = "Overall Leading Digit Distribution"
-    summary_sheet["A5"].font = Font(bold=True, color=UVU_GREEN, size=12)
+    summary_sheet["A5"].font = SECTION_FONT
 
     start_row = 6
     headers = ["Digit", "Actual Count", "Actual %", "Expected %"]
@@ -179,12 +163,10 @@ def main() -> None:
     for row_offset, row in enumerate(overall_table.itertuples(index=False), start=1):
         summary_sheet.cell(row=start_row + row_offset, column=1, value=row.digit)
         summary_sheet.cell(row=start_row + row_offset, column=2, value=row.actual_count)
-        summary_sheet.cell(row=start_row + row_offset, column=3, value=row.actual_percent)
-        summary_sheet.cell(row=start_row + row_offset, column=4, value=row.expected_percent)
-
-    for row in summary_sheet.iter_rows(min_row=start_row + 1, max_row=start_row + 9, min_col=3, max_col=4):
-        for cell in row:
-            cell.number_format = "0.0%"
+        actual_cell = summary_sheet.cell(row=start_row + row_offset, column=3, value=row.actual_percent)
+        actual_cell.number_format = PERCENT_FORMAT
+        expected_cell = summary_sheet.cell(row=start_row + row_offset, column=4, value=row.expected_percent)
+        expected_cell.number_format = PERCENT_FORMAT
 
     chart = BarChart()
     chart.type = "col"
@@ -202,7 +184,7 @@ def main() -> None:
 
     top_row_start = start_row + 12
     summary_sheet["A" + str(top_row_start)].value = "Top MAD Deviations"
-    summary_sheet["A" + str(top_row_start)].font = Font(bold=True, color=UVU_GREEN, size=12)
+    summary_sheet["A" + str(top_row_start)].font = SECTION_FONT
 
     top_headers = ["Sheet", "Column", "Total Values", "Chi-Square", "MAD"]
     for col_idx, header in enumerate(top_headers, start=1):
@@ -242,16 +224,12 @@ def main() -> None:
 
     column_sheet = workbook.create_sheet(title="Column Summary")
     column_headers = ["Sheet", "Column", "Total Values", "Chi-Square", "MAD"]
-    for col_idx, header in enumerate(column_headers, start=1):
-        cell = column_sheet.cell(row=1, column=col_idx, value=header)
+    column_sheet.append(column_headers)
+    for cell in column_sheet[1]:
         apply_header_style(cell)
 
-    for row_idx, row in enumerate(summary_df.itertuples(index=False), start=2):
-        column_sheet.cell(row=row_idx, column=1, value=row.sheet)
-        column_sheet.cell(row=row_idx, column=2, value=row.column)
-        column_sheet.cell(row=row_idx, column=3, value=int(row.total_values))
-        column_sheet.cell(row=row_idx, column=4, value=float(row.chi_square))
-        column_sheet.cell(row=row_idx, column=5, value=float(row.mad))
+    for row in summary_df.itertuples(index=False, name=None):
+        column_sheet.append(row)
 
     detail_sheet = workbook.create_sheet(title="Detail")
     detail_headers = [
@@ -263,49 +241,36 @@ def main() -> None:
         "Expected Proportion",
         "Difference",
     ]
-    for col_idx, header in enumerate(detail_headers, start=1):
-        cell = detail_sheet.cell(row=1, column=col_idx, value=header)
+    detail_sheet.append(detail_headers)
+    for cell in detail_sheet[1]:
         apply_header_style(cell)
 
-    for row_idx, row in enumerate(detail_df.itertuples(index=False), start=2):
-        detail_sheet.cell(row=row_idx, column=1, value=row.sheet)
-        detail_sheet.cell(row=row_idx, column=2, value=row.column)
-        detail_sheet.cell(row=row_idx, column=3, value=int(row.digit))
-        detail_sheet.cell(row=row_idx, column=4, value=int(row.count))
-        detail_sheet.cell(row=row_idx, column=5, value=float(row.proportion))
-        detail_sheet.cell(row=row_idx, column=6, value=float(row.expected_proportion))
-        detail_sheet.cell(row=row_idx, column=7, value=float(row.difference))
-
-    for row in detail_sheet.iter_rows(min_row=2, min_col=5, max_col=7):
-        for cell in row:
-            cell.number_format = "0.0%"
-
-    for sheet in [summary_sheet, column_sheet, detail_sheet]:
-        for row in sheet.iter_rows():
-            for cell in row:
-                if cell.row == 1 and sheet.title == "Summary":
-                    continue
-                if cell.row == 1:
-                    cell.alignment = Alignment(horizontal="center")
-        autofit_columns(sheet)
-
-    accent_fill = PatternFill("solid", fgColor=UVU_LIGHT_GRAY)
-    for row in summary_sheet.iter_rows(min_row=start_row + 1, max_row=start_row + 9, min_col=1, max_col=4):
-        if row[0].row % 2 == 0:
-            for cell in row:
-                cell.fill = accent_fill
-
-    for row in summary_sheet.iter_rows(
-        min_row=top_row_start + 2, max_row=top_row_start + 1 + len(top_deviations), min_col=1, max_col=5
-    ):
-        if row[0].row % 2 == 0:
-            for cell in row:
-                cell.fill = accent_fill
-
-    summary_sheet["A5"].fill = PatternFill("solid", fgColor=UVU_GOLD)
-    summary_sheet["A5"].font = Font(bold=True, color="FFFFFF")
-    summary_sheet["A" + str(top_row_start)].fill = PatternFill("solid", fgColor=UVU_GOLD)
-    summary_sheet["A" + str(top_row_start)].font = Font(bold=True, color="FFFFFF")
+    for row in detail_df.itertuples(index=False, name=None):
+        detail_sheet.append((*row[:4], *(percent_cell(detail_sheet, value) for value in row[4:])))
+
+    # Summary's row 1 is the merged title banner, so only the tabular sheets' headers are re-aligned.
+    for sheet, column_count in [(column_sheet, len(column_headers)), (detail_sheet, len(detail_headers))]:
+        for col_idx in range(1, column_count + 1):
+            sheet.cell(row=1, column=col_idx).alignment = CENTER_HORIZONTAL
+
+    summary_values = pd.DataFrame(summary_sheet.iter_rows(values_only=True)).fillna("")
+    autofit_columns(summary_sheet, summary_values, headers=[""] * summary_values.shape[1])
+    autofit_columns(column_sheet, summary_df, column_headers)
+    autofit_columns(detail_sheet, detail_df, detail_headers)
+
+    # Stripe the even-numbered sheet rows of both tables (start_row and top_row_start are even).
+    for row_idx in range(start_row + 2, start_row + 10, 2):
+        for col_idx in range(1, 5):
+            summary_sheet.cell(row=row_idx, column=col_idx).fill = ACCENT_FILL
+
+    for row_idx in range(top_row_start + 2, top_row_start + 2 + len(top_deviations), 2):
+        for col_idx in range(1, 6):
+            summary_sheet.cell(row=row_idx, column=col_idx).fill = ACCENT_FILL
+
+    summary_sheet["A5"].fill = SECTION_FILL
+    summary_sheet["A5"].font = WHITE_BOLD_FONT
+    summary_sheet["A" + str(top_row_start)].fill = SECTION_FILL
+    summary_sheet["A" + str(top_row_start)].font = WHITE_BOLD_FONT
 
     workbook.save(output_path)
 